@@ -0,0 +1,49 @@
+# listings/cache.py
+import hashlib
+import json
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+# Seconds a cached listing list/search response stays valid
+LISTINGS_CACHE_TIMEOUT = 60
+
+_VERSION_KEY = 'listings:cache-version'
+
+
+def get_listings_cache_version():
+    """Return the version stamp mixed into every cached listing response key"""
+    version = cache.get(_VERSION_KEY)
+    if version is None:
+        # Start from the clock so an evicted counter never reuses an old version
+        cache.add(_VERSION_KEY, time.time_ns(), timeout=None)
+        version = cache.get(_VERSION_KEY)
+    return version
+
+
+def bump_listings_cache_version():
+    """Invalidate all cached listing responses by moving to a new version"""
+    try:
+        cache.incr(_VERSION_KEY)
+    except ValueError:
+        cache.set(_VERSION_KEY, time.time_ns(), timeout=None)
+
+
+def schedule_listings_cache_bump(using=None):
+    """Bump the version once when the current transaction commits, or now outside one"""
+    connection = transaction.get_connection(using)
+    if not connection.in_atomic_block:
+        bump_listings_cache_version()
+        return
+    # Entries are dropped on rollback, so this also re-arms after a rolled back savepoint
+    if any(func is bump_listings_cache_version for _, func, _ in connection.run_on_commit):
+        return
+    transaction.on_commit(bump_listings_cache_version, using=using)
+
+
+def listings_cache_key(kind, *parts):
+    """Build a versioned cache key for a listing response from its request parts"""
+    payload = json.dumps(parts, sort_keys=True, default=str).encode()
+    digest = hashlib.blake2b(payload, digest_size=16).hexdigest()
+    return f'listings:{kind}:{get_listings_cache_version()}:{digest}'
@@ -1,11 +1,134 @@
 # listings/management/commands/seed.py
 import random
 from datetime import timedelta
+from django.conf import settings
 from django.core.management.base import BaseCommand
 from django.contrib.auth.models import User
+from django.contrib.auth.hashers import make_password
+from django.db import connection, transaction
 from django.utils import timezone
+from listings.cache import bump_listings_cache_version
 from listings.models import Listing, Booking, Review, ListingImage
 
+# Models whose Meta.indexes are dropped and rebuilt by --drop-indexes
+INDEXED_MODELS = [Listing, Booking, Review]
+
+# Sample data pools, allocated once at import instead of on every seeding call
+FIRST_NAMES = ('John', 'Jane', 'Mike', 'Sarah', 'David', 'Lisa', 'Chris', 'Emily', 'Alex', 'Maria')
+LAST_NAMES = ('Smith', 'Johnson', 'Williams', 'Brown', 'Jones', 'Garcia', 'Miller', 'Davis', 'Rodriguez', 'Martinez')
+
+CITIES = (
+    ('New York', 'NY', 'USA'),
+    ('Los Angeles', 'CA', 'USA'),
+    ('Chicago', 'IL', 'USA'),
+    ('Miami', 'FL', 'USA'),
+    ('Seattle', 'WA', 'USA'),
+    ('Austin', 'TX', 'USA'),
+    ('Boston', 'MA', 'USA'),
+    ('San Francisco', 'CA', 'USA'),
+    ('London', 'London', 'UK'),
+    ('Paris', 'Île-de-France', 'France'),
+    ('Tokyo', 'Tokyo', 'Japan'),
+    ('Sydney', 'NSW', 'Australia'),
+)
+
+PROPERTY_TYPES = tuple(key for key, _ in Listing.PROPERTY_TYPES)
+
+# Realistic nightly price range per property type
+BASE_PRICE_TABLE = {
+    'apartment': (80, 200),
+    'house': (120, 350),
+    'condo': (90, 250),
+    'villa': (200, 500),
+    'studio': (60, 150),
+    'cabin': (70, 180),
+}
+
+STREETS = ('Main', 'Oak', 'Maple', 'Pine', 'Cedar')
+CLEANING_FEE_OPTIONS = (0, 25, 50, 75)
+SECURITY_DEPOSIT_OPTIONS = (0, 100, 200, 300)
+
+LISTING_TITLES = (
+    "Cozy {type} in {city}",
+    "Beautiful {type} with Amazing Views",
+    "Modern {type} in City Center",
+    "Spacious {type} Near Attractions",
+    "Luxury {type} with Premium Amenities",
+    "Charming {type} in Quiet Neighborhood",
+    "Stylish {type} with Garden",
+    "Bright {type} with Balcony",
+    "Elegant {type} for Families",
+    "Contemporary {type} with Parking",
+)
+
+DESCRIPTIONS = (
+    "This beautiful {type} offers a perfect blend of comfort and style. Located in the heart of {city}, you'll have easy access to all major attractions.",
+    "Experience luxury living in this stunning {type}. Featuring modern amenities and thoughtful design, this is the perfect getaway.",
+    "A cozy retreat in {city} that feels like home. This {type} is perfect for couples, solo adventurers, and business travelers.",
+    "Spacious and well-appointed {type} in a prime location. Enjoy the best of {city} with all the comforts of home.",
+    "Modern {type} with high-end finishes and spectacular views. Perfect for those who appreciate quality and design.",
+)
+
+SPECIAL_REQUESTS = (
+    '',
+    'Early check-in if possible',
+    'Traveling with a small child',
+    'Business trip',
+    'Celebrating anniversary',
+    'Quiet location preferred',
+)
+
+REVIEW_TITLES = (
+    "Great stay!",
+    "Wonderful experience",
+    "Perfect location",
+    "Comfortable and clean",
+    "Would stay again",
+    "Amazing host",
+    "Beautiful property",
+    "Highly recommended",
+    "Lovely place",
+    "Excellent value",
+)
+
+REVIEW_COMMENTS = (
+    "We had a wonderful time at this property. The location was perfect and the host was very responsive.",
+    "Clean, comfortable, and exactly as described. Would definitely recommend to others.",
+    "Great value for the price. The amenities were exactly what we needed for our stay.",
+    "The host was very accommodating and the property was beautiful. We'll be back!",
+    "Perfect location for exploring the city. The property had everything we needed.",
+    "Very comfortable stay with all the necessary amenities. The host was very helpful.",
+    "Beautiful property with great attention to detail. We thoroughly enjoyed our stay.",
+    "The photos don't do this place justice! It was even better in person.",
+    "Excellent communication from the host and a very smooth check-in process.",
+    "We loved our stay here. The property was clean, comfortable, and well-located.",
+)
+
+HOST_RESPONSES = (
+    "Thank you for your kind words! We're so glad you enjoyed your stay.",
+    "We appreciate your feedback and would love to host you again in the future!",
+    "Thank you for being wonderful guests! We're happy you had a great experience.",
+    "We're delighted you enjoyed your stay. Hope to see you again soon!",
+)
+
+IMAGE_DESCRIPTIONS = (
+    "Living room",
+    "Bedroom",
+    "Kitchen",
+    "Bathroom",
+    "Exterior",
+    "Balcony view",
+    "Swimming pool",
+    "Garden",
+    "Dining area",
+    "City view",
+)
+
+
+def random_ints(low, high, k):
+    """Draw k random integers in [low, high] in a single call"""
+    return random.choices(range(low, high + 1), k=k)
+
 
 class Command(BaseCommand):
     help = 'Populate the database with sample listings, bookings, and reviews'
@@ -28,39 +151,72 @@ class Command(BaseCommand):
             default=20,
             help='Number of sample listings to create',
         )
+        parser.add_argument(
+            '--drop-indexes',
+            action='store_true',
+            help='Drop secondary indexes while seeding and rebuild them afterwards (PostgreSQL only)',
+        )
+        parser.add_argument(
+            '--raw-sql',
+            action='store_true',
+            help='Insert listing images with raw multi-row INSERT statements (PostgreSQL only)',
+        )
 
     def handle(self, *args, **options):
         clear_data = options['clear']
         num_users = options['users']
         num_listings = options['listings']
+        drop_indexes = options['drop_indexes'] and connection.vendor == 'postgresql'
+        if options['drop_indexes'] and not drop_indexes:
+            self.stdout.write(
+                self.style.WARNING('--drop-indexes is only supported on PostgreSQL; ignoring it.')
+            )
+        self.raw_sql = options['raw_sql'] and connection.vendor == 'postgresql'
+        if options['raw_sql'] and not self.raw_sql:
+            self.stdout.write(
+                self.style.WARNING('--raw-sql is only supported on PostgreSQL; using bulk_create.')
+            )
+        self.verbosity = options['verbosity']
+        self.batch_size = getattr(settings, 'SEED_BATCH_SIZE', 500)
+        # Algorithm name of a cheaper hasher listed in PASSWORD_HASHERS, e.g. 'md5' for dev
+        self.password_hasher = getattr(settings, 'SEED_PASSWORD_HASHER', 'default')
 
         if clear_data:
             self.stdout.write('Clearing existing data...')
-            ListingImage.objects.all().delete()
-            Review.objects.all().delete()
-            Booking.objects.all().delete()
-            Listing.objects.all().delete()
-            User.objects.filter(is_superuser=False).delete()
+            self.clear_existing_data()
             self.stdout.write(
                 self.style.SUCCESS('Existing data cleared successfully!')
             )
 
         self.stdout.write('Starting database seeding...')
 
-        # Create sample users
-        users = self.create_sample_users(num_users)
-        
-        # Create sample listings
-        listings = self.create_sample_listings(num_listings, users)
-        
-        # Create sample bookings
-        bookings = self.create_sample_bookings(listings, users)
-        
-        # Create sample reviews
-        self.create_sample_reviews(bookings)
-        
-        # Create sample images
-        self.create_sample_images(listings)
+        # Run every insert in one transaction so the seed commits once
+        with transaction.atomic():
+            if drop_indexes:
+                self.drop_indexes()
+            
+            # Create sample users
+            users = self.create_sample_users(num_users)
+            # Listings and bookings only need user ids for their foreign keys
+            user_pks = [user.pk for user in users]
+            
+            # Create sample listings
+            listings = self.create_sample_listings(num_listings, user_pks)
+            
+            # Create sample bookings
+            bookings = self.create_sample_bookings(listings, user_pks)
+            
+            # Create sample reviews
+            self.create_sample_reviews(bookings)
+            
+            # Create sample images
+            self.create_sample_images(listings)
+            
+            if drop_indexes:
+                self.rebuild_indexes()
+
+        # bulk_create skips post_save, so drop cached listing responses explicitly
+        bump_listings_cache_version()
 
         self.stdout.write(
             self.style.SUCCESS(
@@ -73,6 +229,64 @@ class Command(BaseCommand):
             )
         )
 
+    def drop_indexes(self):
+        """Drop Meta.indexes so bulk inserts skip secondary index maintenance"""
+        self.stdout.write('Dropping secondary indexes...')
+        with connection.schema_editor() as schema_editor:
+            for model in INDEXED_MODELS:
+                for index in model._meta.indexes:
+                    schema_editor.remove_index(model, index)
+
+    def rebuild_indexes(self):
+        """Recreate the indexes removed by drop_indexes()"""
+        self.stdout.write('Rebuilding secondary indexes...')
+        with connection.schema_editor() as schema_editor:
+            for model in INDEXED_MODELS:
+                for index in model._meta.indexes:
+                    schema_editor.add_index(model, index)
+
+    def raw_insert(self, model, field_names, rows, batch_size):
+        """Insert value tuples with multi-row INSERT ... RETURNING, bypassing model instances"""
+        opts = model._meta
+        quote_name = connection.ops.quote_name
+        columns = ', '.join(quote_name(opts.get_field(name).column) for name in field_names)
+        placeholder = f"({', '.join(['%s'] * len(field_names))})"
+        # Stay under PostgreSQL's 65535 bind parameter limit per statement
+        batch_size = max(1, min(batch_size, 65535 // len(field_names)))
+        
+        pks = []
+        with connection.cursor() as cursor:
+            for start in range(0, len(rows), batch_size):
+                batch = rows[start:start + batch_size]
+                cursor.execute(
+                    f'INSERT INTO {quote_name(opts.db_table)} ({columns}) '
+                    f'VALUES {", ".join([placeholder] * len(batch))} '
+                    f'RETURNING {quote_name(opts.pk.column)}',
+                    [value for row in batch for value in row],
+                )
+                pks.extend(pk for (pk,) in cursor.fetchall())
+        return pks
+
+    def clear_existing_data(self):
+        """Remove seeded data, keeping superusers"""
+        models = [ListingImage, Review, Booking, Listing]
+        
+        # One transaction so a failure can't leave the clear half done
+        with transaction.atomic():
+            if connection.vendor == 'postgresql':
+                # TRUNCATE skips per-row collection, signals and cascades in Python
+                tables = ', '.join(
+                    connection.ops.quote_name(model._meta.db_table) for model in models
+                )
+                with connection.cursor() as cursor:
+                    cursor.execute(f'TRUNCATE {tables} RESTART IDENTITY CASCADE;')
+            else:
+                for model in models:
+                    model.objects.all().delete()
+            # A regular delete() so groups, permissions and admin log rows cascade;
+            # the listing tables are already empty, so there is little left to collect
+            User.objects.filter(is_superuser=False).delete()
+
     def create_sample_users(self, num_users):
         """Create sample users"""
         self.stdout.write('Creating sample users...')
@@ -81,196 +295,223 @@ class Command(BaseCommand):
         
         # Create a default admin user if it doesn't exist
         if not User.objects.filter(username='admin').exists():
-            admin_user = User.objects.create_superuser(
+            admin_user = User(
                 username='admin',
                 email='admin@alxtravel.com',
-                password='admin123'
+                password=make_password('admin123', hasher=self.password_hasher),
+                is_staff=True,
+                is_superuser=True,
             )
+            admin_user.save()
             users.append(admin_user)
             self.stdout.write(
                 self.style.SUCCESS(f'Created admin user: {admin_user.username}')
             )
 
         # Create regular users
-        first_names = ['John', 'Jane', 'Mike', 'Sarah', 'David', 'Lisa', 'Chris', 'Emily', 'Alex', 'Maria']
-        last_names = ['Smith', 'Johnson', 'Williams', 'Brown', 'Jones', 'Garcia', 'Miller', 'Davis', 'Rodriguez', 'Martinez']
+        first_names = random.choices(FIRST_NAMES, k=num_users)
+        last_names = random.choices(LAST_NAMES, k=num_users)
+        
+        # Hash the shared sample password once instead of once per user
+        shared_hash = None
+        if num_users:
+            shared_hash = make_password('password123', hasher=self.password_hasher)
         
+        user_objs = []
         for i in range(num_users):
-            first_name = random.choice(first_names)
-            last_name = random.choice(last_names)
+            first_name = first_names[i]
+            last_name = last_names[i]
             username = f"{first_name.lower()}{last_name.lower()}{i}"
-            email = f"{username}@example.com"
             
-            user = User.objects.create_user(
+            user_objs.append(User(
                 username=username,
-                email=email,
-                password='password123',
+                email=f"{username}@example.com",
+                password=shared_hash,
                 first_name=first_name,
-                last_name=last_name
-            )
-            users.append(user)
-            self.stdout.write(f'Created user: {user.username}')
+                last_name=last_name,
+                is_active=True,
+            ))
+
+        usernames = [user.username for user in user_objs]
+        # Usernames left over from an earlier seed are reused as hosts/guests, not recreated
+        existing = set(User.objects.filter(username__in=usernames).values_list('username', flat=True))
+        
+        User.objects.bulk_create(user_objs, batch_size=self.batch_size, ignore_conflicts=True)
+        
+        # ignore_conflicts leaves PKs unset, so reload every requested username
+        available_users = list(User.objects.filter(username__in=usernames))
+        users.extend(available_users)
+        
+        if self.verbosity >= 2:
+            for user in available_users:
+                verb = 'Reusing existing' if user.username in existing else 'Created'
+                self.stdout.write(f'{verb} user: {user.username}')
+        self.stdout.write(
+            f'{len(available_users)} users available '
+            f'({len(available_users) - len(existing)} created, {len(existing)} already existed)'
+        )
 
         return users
 
-    def create_sample_listings(self, num_listings, users):
+    def create_sample_listings(self, num_listings, user_pks):
         """Create sample listings"""
         self.stdout.write('Creating sample listings...')
         
-        cities = [
-            ('New York', 'NY', 'USA'),
-            ('Los Angeles', 'CA', 'USA'),
-            ('Chicago', 'IL', 'USA'),
-            ('Miami', 'FL', 'USA'),
-            ('Seattle', 'WA', 'USA'),
-            ('Austin', 'TX', 'USA'),
-            ('Boston', 'MA', 'USA'),
-            ('San Francisco', 'CA', 'USA'),
-            ('London', 'London', 'UK'),
-            ('Paris', 'Île-de-France', 'France'),
-            ('Tokyo', 'Tokyo', 'Japan'),
-            ('Sydney', 'NSW', 'Australia'),
-        ]
-        
-        listing_titles = [
-            "Cozy {type} in {city}",
-            "Beautiful {type} with Amazing Views",
-            "Modern {type} in City Center",
-            "Spacious {type} Near Attractions",
-            "Luxury {type} with Premium Amenities",
-            "Charming {type} in Quiet Neighborhood",
-            "Stylish {type} with Garden",
-            "Bright {type} with Balcony",
-            "Elegant {type} for Families",
-            "Contemporary {type} with Parking",
-        ]
-        
-        descriptions = [
-            "This beautiful {type} offers a perfect blend of comfort and style. Located in the heart of {city}, you'll have easy access to all major attractions.",
-            "Experience luxury living in this stunning {type}. Featuring modern amenities and thoughtful design, this is the perfect getaway.",
-            "A cozy retreat in {city} that feels like home. This {type} is perfect for couples, solo adventurers, and business travelers.",
-            "Spacious and well-appointed {type} in a prime location. Enjoy the best of {city} with all the comforts of home.",
-            "Modern {type} with high-end finishes and spectacular views. Perfect for those who appreciate quality and design.",
-        ]
+        # Draw every random column up front so the loop below only assembles rows
+        n = num_listings
+        locations = random.choices(CITIES, k=n)
+        property_types = random.choices(PROPERTY_TYPES, k=n)
+        host_ids = random.choices(user_pks, k=n)
+        title_templates = random.choices(LISTING_TITLES, k=n)
+        description_templates = random.choices(DESCRIPTIONS, k=n)
+        street_numbers = random_ints(100, 999, n)
+        streets = random.choices(STREETS, k=n)
+        zip_codes = random_ints(10000, 99999, n)
+        latitudes = [random.uniform(-90, 90) for _ in range(n)]
+        longitudes = [random.uniform(-180, 180) for _ in range(n)]
+        max_guests = random_ints(2, 8, n)
+        bedrooms = random_ints(1, 4, n)
+        beds = random_ints(1, 6, n)
+        bathrooms = random_ints(1, 3, n)
+        price_draws = [random.random() for _ in range(n)]
+        # One draw per listing: bits 0-6 are the amenity flags, bits 7-8 and 9-10
+        # index the cleaning fee and security deposit options
+        packed_draws = [random.getrandbits(11) for _ in range(n)]
+        minimum_stays = random_ints(1, 3, n)
+        maximum_stays = random_ints(14, 60, n)
         
         listings = []
         
-        for i in range(num_listings):
-            city, state, country = random.choice(cities)
-            property_type = random.choice(['apartment', 'house', 'condo', 'villa', 'studio', 'cabin'])
-            host = random.choice(users)
+        for i in range(n):
+            city, state, country = locations[i]
+            property_type = property_types[i]
             
-            title_template = random.choice(listing_titles)
-            title = title_template.format(type=property_type.title(), city=city)
+            title = title_templates[i].format(type=property_type.title(), city=city)
+            description = description_templates[i].format(type=property_type, city=city)
             
-            description_template = random.choice(descriptions)
-            description = description_template.format(type=property_type, city=city)
+            min_price, max_price = BASE_PRICE_TABLE[property_type]
+            base_price = min_price + int(price_draws[i] * (max_price - min_price + 1))
             
-            # Generate realistic pricing based on property type and location
-            base_prices = {
-                'apartment': (80, 200),
-                'house': (120, 350),
-                'condo': (90, 250),
-                'villa': (200, 500),
-                'studio': (60, 150),
-                'cabin': (70, 180),
-            }
-            min_price, max_price = base_prices[property_type]
-            base_price = random.randint(min_price, max_price)
+            bits = packed_draws[i]
             
-            listing = Listing.objects.create(
+            listings.append(Listing(
                 title=title,
                 description=description,
                 property_type=property_type,
-                address=f"{random.randint(100, 999)} {random.choice(['Main', 'Oak', 'Maple', 'Pine', 'Cedar'])} St",
+                address=f"{street_numbers[i]} {streets[i]} St",
                 city=city,
                 state=state,
                 country=country,
-                zip_code=f"{random.randint(10000, 99999)}",
-                latitude=random.uniform(-90, 90),
-                longitude=random.uniform(-180, 180),
-                max_guests=random.randint(2, 8),
-                bedrooms=random.randint(1, 4),
-                beds=random.randint(1, 6),
-                bathrooms=random.randint(1, 3),
-                wifi=random.choice([True, False]),
-                kitchen=random.choice([True, False]),
-                parking=random.choice([True, False]),
-                pool=random.choice([True, False]),
-                air_conditioning=random.choice([True, False]),
-                heating=random.choice([True, False]),
-                tv=random.choice([True, False]),
+                zip_code=f"{zip_codes[i]}",
+                latitude=latitudes[i],
+                longitude=longitudes[i],
+                max_guests=max_guests[i],
+                bedrooms=bedrooms[i],
+                beds=beds[i],
+                bathrooms=bathrooms[i],
+                wifi=bool(bits & 1),
+                kitchen=bool(bits & 2),
+                parking=bool(bits & 4),
+                pool=bool(bits & 8),
+                air_conditioning=bool(bits & 16),
+                heating=bool(bits & 32),
+                tv=bool(bits & 64),
                 base_price=base_price,
-                cleaning_fee=random.choice([0, 25, 50, 75]),
-                security_deposit=random.choice([0, 100, 200, 300]),
-                host=host,
+                cleaning_fee=CLEANING_FEE_OPTIONS[(bits >> 7) & 3],
+                security_deposit=SECURITY_DEPOSIT_OPTIONS[(bits >> 9) & 3],
+                host_id=host_ids[i],
                 status='active',
-                minimum_stay=random.randint(1, 3),
-                maximum_stay=random.randint(14, 60),
-            )
-            listings.append(listing)
-            self.stdout.write(f'Created listing: {listing.title}')
+                minimum_stay=minimum_stays[i],
+                maximum_stay=maximum_stays[i],
+            ))
+
+        Listing.objects.bulk_create(listings, batch_size=self.batch_size)
+        
+        if self.verbosity >= 2:
+            for listing in listings:
+                self.stdout.write(f'Created listing: {listing.title}')
+        self.stdout.write(f'Created {len(listings)} listings')
 
         return listings
 
-    def create_sample_bookings(self, listings, users):
+    def create_sample_bookings(self, listings, user_pks):
         """Create sample bookings"""
         self.stdout.write('Creating sample bookings...')
         
+        user_index = {pk: i for i, pk in enumerate(user_pks)}
+        today = timezone.now().date()
+        
+        # Create 1-3 bookings per listing, drawing every per-booking column up front
+        bookings_per_listing = random_ints(1, 3, len(listings))
+        total = sum(bookings_per_listing)
+        # Guests are drawn one slot short of the user list and skip over the host below
+        guest_draws = random_ints(0, len(user_pks) - 2, total)
+        days_ago = random_ints(1, 180, total)
+        durations = random_ints(2, 14, total)
+        future_statuses = random.choices(('pending', 'confirmed'), k=total)
+        party_size_draws = [random.random() for _ in range(total)]
+        confirmation_leads = random_ints(1, 7, total)
+        special_requests = random.choices(SPECIAL_REQUESTS, k=total)
+        payment_statuses = random.choices(('pending', 'completed'), k=total)
+        
         bookings = []
+        j = 0
         
-        for listing in listings:
-            # Create 1-3 bookings per listing
-            num_bookings = random.randint(1, 3)
+        for listing, num_bookings in zip(listings, bookings_per_listing):
+            host_index = user_index[listing.host_id]
+            # Seeded listings still hold the plain ints they were built with (bulk_create
+            # doesn't reload them), so pricing below stays in int arithmetic
+            base_price = listing.base_price
+            cleaning_fee = listing.cleaning_fee
+            security_deposit = listing.security_deposit
+            max_guests = listing.max_guests
             
             for _ in range(num_bookings):
-                guest = random.choice([u for u in users if u != listing.host])
+                # Pick any user but the host
+                guest_index = guest_draws[j]
+                if guest_index >= host_index:
+                    guest_index += 1
                 
                 # Generate random dates in the past and future
-                days_ago = random.randint(1, 180)
-                check_in = timezone.now().date() - timedelta(days=days_ago)
-                duration = random.randint(2, 14)
+                check_in = today - timedelta(days=days_ago[j])
+                duration = durations[j]
                 check_out = check_in + timedelta(days=duration)
                 
                 # Determine booking status based on dates
-                today = timezone.now().date()
                 if check_out < today:
                     status = 'completed'
                 elif check_in <= today <= check_out:
                     status = 'active'
                 else:
-                    status = random.choice(['pending', 'confirmed'])
+                    status = future_statuses[j]
+                
+                number_of_guests = 1 + int(party_size_draws[j] * max_guests)
+                total_price = duration * base_price + cleaning_fee
                 
-                number_of_guests = random.randint(1, listing.max_guests)
-                total_price = duration * listing.base_price + listing.cleaning_fee
+                # Set timestamps based on status
+                confirmed_at = None
+                if status in ['confirmed', 'active', 'completed']:
+                    confirmed_at = check_in - timedelta(days=confirmation_leads[j])
                 
-                booking = Booking.objects.create(
-                    listing=listing,
-                    guest=guest,
+                bookings.append(Booking(
+                    listing_id=listing.pk,
+                    guest_id=user_pks[guest_index],
                     check_in=check_in,
                     check_out=check_out,
                     number_of_guests=number_of_guests,
-                    guest_special_requests=random.choice([
-                        '', 
-                        'Early check-in if possible',
-                        'Traveling with a small child',
-                        'Business trip',
-                        'Celebrating anniversary',
-                        'Quiet location preferred'
-                    ]),
+                    guest_special_requests=special_requests[j],
                     total_price=total_price,
-                    security_deposit_held=listing.security_deposit,
+                    security_deposit_held=security_deposit,
                     status=status,
-                    payment_status=random.choice(['pending', 'completed']),
-                )
-                
-                # Set timestamps based on status
-                if status in ['confirmed', 'active', 'completed']:
-                    booking.confirmed_at = check_in - timedelta(days=random.randint(1, 7))
-                    booking.save()
-                
-                bookings.append(booking)
-                self.stdout.write(f'Created booking for {listing.title}')
+                    payment_status=payment_statuses[j],
+                    confirmed_at=confirmed_at,
+                ))
+                j += 1
+                if self.verbosity >= 2:
+                    self.stdout.write(f'Created booking for {listing.title}')
+
+        Booking.objects.bulk_create(bookings, batch_size=self.batch_size)
+        self.stdout.write(f'Created {len(bookings)} bookings')
 
         return bookings
 
@@ -278,92 +519,96 @@ class Command(BaseCommand):
         """Create sample reviews for completed bookings"""
         self.stdout.write('Creating sample reviews...')
         
-        review_titles = [
-            "Great stay!",
-            "Wonderful experience",
-            "Perfect location",
-            "Comfortable and clean",
-            "Would stay again",
-            "Amazing host",
-            "Beautiful property",
-            "Highly recommended",
-            "Lovely place",
-            "Excellent value",
+        # Only create reviews for completed bookings (50% chance)
+        completed = [booking for booking in bookings if booking.status == 'completed']
+        reviewed = [
+            booking for booking, keep in zip(completed, random.choices((True, False), k=len(completed)))
+            if keep
         ]
+        ratings = random_ints(4, 5, len(reviewed))  # Mostly positive reviews
+        titles = random.choices(REVIEW_TITLES, k=len(reviewed))
+        comments = random.choices(REVIEW_COMMENTS, k=len(reviewed))
         
-        review_comments = [
-            "We had a wonderful time at this property. The location was perfect and the host was very responsive.",
-            "Clean, comfortable, and exactly as described. Would definitely recommend to others.",
-            "Great value for the price. The amenities were exactly what we needed for our stay.",
-            "The host was very accommodating and the property was beautiful. We'll be back!",
-            "Perfect location for exploring the city. The property had everything we needed.",
-            "Very comfortable stay with all the necessary amenities. The host was very helpful.",
-            "Beautiful property with great attention to detail. We thoroughly enjoyed our stay.",
-            "The photos don't do this place justice! It was even better in person.",
-            "Excellent communication from the host and a very smooth check-in process.",
-            "We loved our stay here. The property was clean, comfortable, and well-located.",
+        # bulk_create skips Review.save(), so link listing and author here
+        reviews = [
+            Review(
+                listing_id=booking.listing_id,
+                booking_id=booking.pk,
+                author_id=booking.guest_id,
+                rating=rating,
+                title=title,
+                comment=comment,
+                is_verified=True,
+                is_public=True,
+            )
+            for booking, rating, title, comment in zip(reviewed, ratings, titles, comments)
         ]
         
-        for booking in bookings:
-            # Only create reviews for completed bookings (50% chance)
-            if booking.status == 'completed' and random.choice([True, False]):
-                rating = random.randint(4, 5)  # Mostly positive reviews
-                
-                review = Review.objects.create(
-                    listing=booking.listing,
-                    booking=booking,
-                    author=booking.guest,
-                    rating=rating,
-                    title=random.choice(review_titles),
-                    comment=random.choice(review_comments),
-                    is_verified=True,
-                    is_public=True,
-                )
-                
-                # Add host response for some reviews (30% chance)
-                if random.random() < 0.3:
-                    host_responses = [
-                        "Thank you for your kind words! We're so glad you enjoyed your stay.",
-                        "We appreciate your feedback and would love to host you again in the future!",
-                        "Thank you for being wonderful guests! We're happy you had a great experience.",
-                        "We're delighted you enjoyed your stay. Hope to see you again soon!",
-                    ]
-                    review.host_response = random.choice(host_responses)
-                    review.host_response_at = review.created_at + timedelta(hours=random.randint(1, 24))
-                    review.save()
-                
-                self.stdout.write(f'Created review for {booking.listing.title}')
+        Review.objects.bulk_create(reviews, batch_size=self.batch_size)
+        
+        # Add host response for some reviews (30% chance)
+        responded = [review for review in reviews if random.random() < 0.3]
+        responses = random.choices(HOST_RESPONSES, k=len(responded))
+        response_delays = random_ints(1, 24, len(responded))
+        for review, response, hours in zip(responded, responses, response_delays):
+            review.host_response = response
+            review.host_response_at = review.created_at + timedelta(hours=hours)
+        
+        Review.objects.bulk_update(
+            responded, ['host_response', 'host_response_at'], batch_size=self.batch_size
+        )
+        self.stdout.write(f'Created {len(reviews)} reviews ({len(responded)} with host responses)')
 
     def create_sample_images(self, listings):
         """Create placeholder image references (in a real app, these would be actual image files)"""
         self.stdout.write('Creating sample image references...')
         
-        image_descriptions = [
-            "Living room",
-            "Bedroom",
-            "Kitchen",
-            "Bathroom",
-            "Exterior",
-            "Balcony view",
-            "Swimming pool",
-            "Garden",
-            "Dining area",
-            "City view",
-        ]
+        # Create 3-6 images per listing, drawing file numbers and captions up front
+        images_per_listing = random_ints(3, 6, len(listings))
+        total = sum(images_per_listing)
+        sample_numbers = random_ints(1, 10, total)
+        captions = random.choices(IMAGE_DESCRIPTIONS, k=total)
         
-        for listing in listings:
-            # Create 3-6 images per listing
-            num_images = random.randint(3, 6)
-            
+        # (listing_id, image, caption, is_primary, order) per image
+        rows = []
+        
+        for listing, num_images in zip(listings, images_per_listing):
             for i in range(num_images):
+                j = len(rows)
                 is_primary = (i == 0)  # First image is primary
                 
-                ListingImage.objects.create(
-                    listing=listing,
-                    image=f'listing_images/sample_{random.randint(1, 10)}.jpg',  # Placeholder
-                    caption=random.choice(image_descriptions),
-                    is_primary=is_primary,
-                    order=i,
-                )
+                rows.append((
+                    listing.pk,
+                    f'listing_images/sample_{sample_numbers[j]}.jpg',  # Placeholder
+                    captions[j],
+                    is_primary,
+                    i,
+                ))
             
-            self.stdout.write(f'Created {num_images} images for {listing.title}')
\ No newline at end of file
+            if self.verbosity >= 2:
+                self.stdout.write(f'Created {num_images} images for {listing.title}')
+
+        if self.raw_sql:
+            # auto_now_add is applied by the ORM, so supply created_at ourselves
+            created_at = timezone.now()
+            self.raw_insert(
+                ListingImage,
+                ['listing', 'image', 'caption', 'is_primary', 'order', 'created_at'],
+                [row + (created_at,) for row in rows],
+                batch_size=1000,
+            )
+        else:
+            ListingImage.objects.bulk_create(
+                [
+                    ListingImage(
+                        listing_id=listing_id,
+                        image=image,
+                        caption=caption,
+                        is_primary=is_primary,
+                        order=order,
+                    )
+                    for listing_id, image, caption, is_primary, order in rows
+                ],
+                batch_size=1000,
+            )
+        self.stdout.write(f'Created {len(rows)} images')
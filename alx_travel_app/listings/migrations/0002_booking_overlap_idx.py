@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-14 13:48
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('listings', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(condition=models.Q(('status__in', ['confirmed', 'active'])), fields=['listing', 'status', 'check_in', 'check_out'], name='booking_overlap_idx'),
+        ),
+    ]
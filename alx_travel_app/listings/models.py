@@ -1,10 +1,34 @@
 # listings/models.py
 from django.db import models
+from django.db.models import Avg, Count, Exists, OuterRef
 from django.contrib.auth.models import User
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.utils import timezone
 
 
+class ListingQuerySet(models.QuerySet):
+    def with_ratings(self):
+        """Annotate average rating and review count in the same query"""
+        return self.annotate(
+            _avg_rating=Avg('reviews__rating'),
+            _review_count=Count('reviews'),
+        )
+    
+    def with_availability(self, check_in, check_out):
+        """Annotate whether no confirmed or active booking overlaps the dates"""
+        overlap = Booking.objects.filter(
+            listing_id=OuterRef('pk'),
+            check_in__lt=check_out,
+            check_out__gt=check_in,
+            status__in=['confirmed', 'active'],
+        )
+        return self.annotate(_is_available=~Exists(overlap))
+    
+    def filter_available(self, check_in, check_out):
+        """Keep listings with no confirmed or active booking overlapping the dates"""
+        return self.with_availability(check_in, check_out).filter(_is_available=True)
+
+
 class Listing(models.Model):
     PROPERTY_TYPES = [
         ('apartment', 'Apartment'),
@@ -69,6 +93,8 @@ class Listing(models.Model):
     minimum_stay = models.PositiveIntegerField(default=1)
     maximum_stay = models.PositiveIntegerField(default=30)
     
+    objects = ListingQuerySet.as_manager()
+    
     class Meta:
         ordering = ['-created_at']
         indexes = [
@@ -91,14 +117,15 @@ class Listing(models.Model):
     @property
     def average_rating(self):
         """Calculate average rating from reviews"""
-        reviews = self.reviews.all()
-        if reviews:
-            return sum(review.rating for review in reviews) / len(reviews)
-        return 0
+        if hasattr(self, '_avg_rating'):
+            return self._avg_rating or 0
+        return self.reviews.aggregate(avg=Avg('rating'))['avg'] or 0
     
     @property
     def review_count(self):
         """Get total number of reviews"""
+        if hasattr(self, '_review_count'):
+            return self._review_count
         return self.reviews.count()
 
 
@@ -146,6 +173,12 @@ class Booking(models.Model):
             models.Index(fields=['listing', 'check_in', 'check_out']),
             models.Index(fields=['guest', 'status']),
             models.Index(fields=['status']),
+            # Covers the availability overlap lookups, which only consider these statuses
+            models.Index(
+                fields=['listing', 'status', 'check_in', 'check_out'],
+                name='booking_overlap_idx',
+                condition=models.Q(status__in=['confirmed', 'active']),
+            ),
         ]
         constraints = [
             models.CheckConstraint(
@@ -165,15 +198,21 @@ class Booking(models.Model):
     @property
     def is_active(self):
         """Check if booking is currently active"""
-        today = timezone.now().date()
-        return (self.status == 'active' and 
-                self.check_in <= today <= self.check_out)
+        # Only read the clock for active bookings; serializers call this for every row
+        if self.status != 'active':
+            return False
+        return self.check_in <= timezone.now().date() <= self.check_out
     
     @property
     def can_be_cancelled(self):
         """Check if booking can be cancelled"""
         return self.status in ['pending', 'confirmed'] and not self.is_active
     
+    @property
+    def total_price_formatted(self):
+        """Total price rendered for display, e.g. $120.00"""
+        return f"${self.total_price:.2f}"
+    
     def calculate_total_price(self):
         """Calculate total price based on duration and listing prices"""
         duration = self.duration
@@ -225,9 +264,10 @@ class Review(models.Model):
     
     def save(self, *args, **kwargs):
         """Override save to ensure review is linked to the correct booking and listing"""
-        if self.booking:
-            self.listing = self.booking.listing
-            self.author = self.booking.guest
+        if self.booking_id:
+            # Copy the FK ids so the booking's listing and guest rows aren't fetched
+            self.listing_id = self.booking.listing_id
+            self.author_id = self.booking.guest_id
         super().save(*args, **kwargs)
 
 
@@ -1,8 +1,79 @@
 # listings/serializers.py
 from rest_framework import serializers
+from django.db.models import Prefetch
 from .models import Listing, Booking, Review, ListingImage
 from django.utils import timezone
 from datetime import date
+from decimal import Decimal
+
+# Allowed (current, new) booking status changes
+_VALID_TRANSITIONS = frozenset({
+    ('pending', 'confirmed'),
+    ('pending', 'cancelled'),
+    ('confirmed', 'active'),
+    ('confirmed', 'cancelled'),
+    ('active', 'completed'),
+})
+
+# Transitions that stamp confirmed_at / cancelled_at
+_CONFIRMED_AT_TRANSITIONS = frozenset({('pending', 'confirmed')})
+_CANCELLED_AT_TRANSITIONS = frozenset({('pending', 'cancelled'), ('confirmed', 'cancelled')})
+
+# Listing boolean fields that may be used as amenity filters
+AMENITY_FIELDS = ('wifi', 'kitchen', 'parking', 'pool', 'air_conditioning', 'heating', 'tv')
+
+
+def requested_fields(context):
+    """Field names from the request's ?fields=a,b,c, or None when all fields are wanted"""
+    request = (context or {}).get('request')
+    fields = request.query_params.get('fields') if request is not None else None
+    if not fields:
+        return None
+    return {name.strip() for name in fields.split(',') if name.strip()}
+
+
+class DynamicFieldsMixin:
+    """Render only the fields named in ?fields= (sparse fieldsets) on read"""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        requested = requested_fields(self.context)
+        # Input serializers keep every field so writes aren't silently dropped
+        if requested is None or 'data' in kwargs:
+            return
+        for name in set(self.fields) - requested:
+            self.fields.pop(name)
+
+
+class EagerLoadingMixin:
+    """Load the relations a serializer renders, as declared on its Meta"""
+    
+    @classmethod
+    def setup_eager_loading(cls, queryset, context=None):
+        select_related_fields = getattr(cls.Meta, 'select_related_fields', ())
+        prefetch_related_fields = getattr(cls.Meta, 'prefetch_related_fields', ())
+        
+        if issubclass(cls, DynamicFieldsMixin) and requested_fields(context) is not None:
+            sources = {field.source.split('.')[0] for field in cls(context=context).fields.values()}
+        else:
+            sources = None
+        
+        # Skip relations none of the requested fields read from; method fields
+        # (source '*') may read anything, so keep every relation for them
+        if sources is not None and '*' not in sources:
+            select_related_fields = [
+                lookup for lookup in select_related_fields if lookup.split('__')[0] in sources
+            ]
+            prefetch_related_fields = [
+                lookup for lookup in prefetch_related_fields
+                if getattr(lookup, 'prefetch_to', lookup).split('__')[0] in sources
+            ]
+        
+        if select_related_fields:
+            queryset = queryset.select_related(*select_related_fields)
+        if prefetch_related_fields:
+            queryset = queryset.prefetch_related(*prefetch_related_fields)
+        return queryset
 
 
 class ListingImageSerializer(serializers.ModelSerializer):
@@ -12,12 +83,13 @@ class ListingImageSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at']
 
 
-class ListingSerializer(serializers.ModelSerializer):
+class ListingSerializer(DynamicFieldsMixin, EagerLoadingMixin, serializers.ModelSerializer):
     images = ListingImageSerializer(many=True, read_only=True)
     average_rating = serializers.ReadOnlyField()
     review_count = serializers.ReadOnlyField()
     host_name = serializers.CharField(source='host.username', read_only=True)
-    is_available = serializers.SerializerMethodField()
+    # Annotated by ListingQuerySet.with_availability
+    is_available = serializers.BooleanField(source='_is_available', read_only=True)
     
     class Meta:
         model = Listing
@@ -31,12 +103,43 @@ class ListingSerializer(serializers.ModelSerializer):
             'maximum_stay', 'average_rating', 'review_count', 'images', 'is_available'
         ]
         read_only_fields = ['host', 'created_at', 'updated_at', 'average_rating', 'review_count']
+        select_related_fields = ['host']
+        prefetch_related_fields = ['images']
+
+
+class ListingListSerializer(DynamicFieldsMixin, EagerLoadingMixin, serializers.ModelSerializer):
+    """Compact serializer for listing list and search results"""
+    thumbnail = serializers.SerializerMethodField()
+    average_rating = serializers.ReadOnlyField()
+    review_count = serializers.ReadOnlyField()
+    host_name = serializers.CharField(source='host.username', read_only=True)
+    is_available = serializers.BooleanField(source='_is_available', read_only=True)
     
-    def get_is_available(self, obj):
-        """Check if listing is available for default dates (next 30 days)"""
-        check_in = date.today()
-        check_out = check_in + timezone.timedelta(days=30)
-        return obj.is_available(check_in, check_out)
+    class Meta:
+        model = Listing
+        fields = [
+            'id', 'title', 'property_type', 'city', 'country', 'base_price',
+            'host', 'host_name', 'average_rating', 'review_count', 'is_available',
+            'thumbnail'
+        ]
+        read_only_fields = fields
+        select_related_fields = ['host']
+        # List rows only render the primary image's URL
+        prefetch_related_fields = [
+            Prefetch(
+                'images',
+                queryset=ListingImage.objects.filter(is_primary=True).only('id', 'image', 'listing_id'),
+                to_attr='_primary',
+            )
+        ]
+    
+    def get_thumbnail(self, obj):
+        """URL of the listing's primary image, or None when it has none"""
+        if not obj._primary:
+            return None
+        url = obj._primary[0].image.url
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request is not None else url
 
 
 class CreateListingSerializer(serializers.ModelSerializer):
@@ -57,7 +160,7 @@ class CreateListingSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
-class BookingSerializer(serializers.ModelSerializer):
+class BookingSerializer(DynamicFieldsMixin, EagerLoadingMixin, serializers.ModelSerializer):
     listing_title = serializers.CharField(source='listing.title', read_only=True)
     listing_city = serializers.CharField(source='listing.city', read_only=True)
     listing_country = serializers.CharField(source='listing.country', read_only=True)
@@ -66,7 +169,7 @@ class BookingSerializer(serializers.ModelSerializer):
     duration = serializers.ReadOnlyField()
     is_active = serializers.ReadOnlyField()
     can_be_cancelled = serializers.ReadOnlyField()
-    total_price_display = serializers.SerializerMethodField()
+    total_price_display = serializers.CharField(source='total_price_formatted', read_only=True)
     
     class Meta:
         model = Booking
@@ -83,9 +186,7 @@ class BookingSerializer(serializers.ModelSerializer):
             'created_at', 'updated_at', 'confirmed_at', 'cancelled_at',
             'payment_intent_id', 'duration', 'is_active', 'can_be_cancelled'
         ]
-    
-    def get_total_price_display(self, obj):
-        return f"${obj.total_price:.2f}"
+        select_related_fields = ['listing', 'guest']
 
 
 class CreateBookingSerializer(serializers.ModelSerializer):
@@ -101,20 +202,21 @@ class CreateBookingSerializer(serializers.ModelSerializer):
         ]
     
     def validate(self, data):
+        check_in = data['check_in']
+        check_out = data['check_out']
+        
         # Check if check-out is after check-in
-        if data['check_in'] >= data['check_out']:
+        if check_in >= check_out:
             raise serializers.ValidationError("Check-out date must be after check-in date.")
         
         # Check if dates are in the future
-        if data['check_in'] < date.today():
+        if check_in < date.today():
             raise serializers.ValidationError("Check-in date cannot be in the past.")
         
         listing = data['listing']
+        duration = (check_out - check_in).days
         
-        # Check if listing is available
-        if not listing.is_available(data['check_in'], data['check_out']):
-            raise serializers.ValidationError("This listing is not available for the selected dates.")
-        
+        # Run the in-memory checks first so invalid requests never reach the database
         # Check guest count
         if data['number_of_guests'] > listing.max_guests:
             raise serializers.ValidationError(
@@ -122,7 +224,6 @@ class CreateBookingSerializer(serializers.ModelSerializer):
             )
         
         # Check minimum stay
-        duration = (data['check_out'] - data['check_in']).days
         if duration < listing.minimum_stay:
             raise serializers.ValidationError(
                 f"Minimum stay for this listing is {listing.minimum_stay} nights."
@@ -134,6 +235,10 @@ class CreateBookingSerializer(serializers.ModelSerializer):
                 f"Maximum stay for this listing is {listing.maximum_stay} nights."
             )
         
+        # Check if listing is available
+        if not listing.is_available(check_in, check_out):
+            raise serializers.ValidationError("This listing is not available for the selected dates.")
+        
         # Add duration to validated data for use in create method
         data['duration'] = duration
         return data
@@ -142,18 +247,19 @@ class CreateBookingSerializer(serializers.ModelSerializer):
         # Calculate total price
         listing = validated_data['listing']
         duration = validated_data.pop('duration')  # Remove duration as it's not a model field
-        base_cost = duration * listing.base_price
-        total_price = base_cost + listing.cleaning_fee
+        # Prices have two decimal places, so do the arithmetic in integer cents
+        base_cents = int(listing.base_price * 100)
+        total_cents = duration * base_cents + int(listing.cleaning_fee * 100)
         
         # Set the guest to the current user
         validated_data['guest'] = self.context['request'].user
-        validated_data['total_price'] = total_price
+        validated_data['total_price'] = Decimal(total_cents).scaleb(-2)
         validated_data['security_deposit_held'] = listing.security_deposit
         
         return super().create(validated_data)
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class ReviewSerializer(EagerLoadingMixin, serializers.ModelSerializer):
     author_name = serializers.CharField(source='author.username', read_only=True)
     author_email = serializers.CharField(source='author.email', read_only=True)
     listing_title = serializers.CharField(source='listing.title', read_only=True)
@@ -172,6 +278,7 @@ class ReviewSerializer(serializers.ModelSerializer):
             'id', 'author', 'listing', 'created_at', 'updated_at',
             'host_response_at', 'is_verified'
         ]
+        select_related_fields = ['author', 'listing', 'booking']
     
     def validate(self, data):
         # Ensure the user can only review their own completed bookings
@@ -217,16 +324,8 @@ class BookingStatusSerializer(serializers.ModelSerializer):
         fields = ['status']
     
     def validate_status(self, value):
-        valid_transitions = {
-            'pending': ['confirmed', 'cancelled'],
-            'confirmed': ['active', 'cancelled'],
-            'active': ['completed'],
-            'completed': [],
-            'cancelled': []
-        }
-        
         current_status = self.instance.status
-        if value not in valid_transitions[current_status]:
+        if (current_status, value) not in _VALID_TRANSITIONS:
             raise serializers.ValidationError(
                 f"Cannot change status from {current_status} to {value}"
             )
@@ -234,12 +333,12 @@ class BookingStatusSerializer(serializers.ModelSerializer):
         return value
     
     def update(self, instance, validated_data):
-        new_status = validated_data['status']
+        transition = (instance.status, validated_data['status'])
         
         # Set timestamps based on status changes
-        if new_status == 'confirmed' and instance.status == 'pending':
+        if transition in _CONFIRMED_AT_TRANSITIONS:
             validated_data['confirmed_at'] = timezone.now()
-        elif new_status == 'cancelled' and instance.status in ['pending', 'confirmed']:
+        elif transition in _CANCELLED_AT_TRANSITIONS:
             validated_data['cancelled_at'] = timezone.now()
         
         return super().update(instance, validated_data)
@@ -256,7 +355,7 @@ class ListingSearchSerializer(serializers.Serializer):
     min_price = serializers.DecimalField(required=False, max_digits=10, decimal_places=2, min_value=0)
     max_price = serializers.DecimalField(required=False, max_digits=10, decimal_places=2, min_value=0)
     amenities = serializers.ListField(
-        child=serializers.CharField(),
+        child=serializers.ChoiceField(choices=AMENITY_FIELDS),
         required=False
     )
     
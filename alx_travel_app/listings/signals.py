@@ -0,0 +1,18 @@
+# listings/signals.py
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from .cache import schedule_listings_cache_bump
+from .models import Listing, Booking, Review, ListingImage
+
+# Only post_save is hooked: a post_delete receiver would disable Django's fast
+# delete path for these models, so delete paths bump the cache version themselves.
+
+
+@receiver(post_save, sender=Listing)
+@receiver(post_save, sender=Booking)
+@receiver(post_save, sender=Review)
+@receiver(post_save, sender=ListingImage)
+def invalidate_listing_responses(sender, using=None, **kwargs):
+    """Drop cached listing list/search responses whenever data they render changes"""
+    schedule_listings_cache_bump(using)
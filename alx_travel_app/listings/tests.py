@@ -1,3 +1,97 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.contrib.auth.models import User
 from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from .models import Listing, Booking
+
+
+class BookingCancelTests(TestCase):
+    """BookingViewSet.cancel status codes and the fields it writes"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.host = User.objects.create_user(username='host', password='pass')
+        cls.guest = User.objects.create_user(username='guest', password='pass')
+        cls.other_guest = User.objects.create_user(username='other', password='pass')
+        cls.listing = Listing.objects.create(
+            title='Test Listing', description='A place to stay', property_type='apartment',
+            address='1 Main St', city='Boston', state='MA', country='USA', zip_code='02101',
+            max_guests=4, bedrooms=2, beds=2, bathrooms=1, base_price=Decimal('100.00'),
+            host=cls.host,
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.guest)
+
+    def create_booking(self, guest=None, booking_status='pending'):
+        check_in = date.today() + timedelta(days=10)
+        return Booking.objects.create(
+            listing=self.listing, guest=guest or self.guest, check_in=check_in,
+            check_out=check_in + timedelta(days=3), number_of_guests=2,
+            total_price=Decimal('300.00'), status=booking_status,
+        )
+
+    def cancel_url(self, pk):
+        return reverse('booking-cancel', args=[pk])
+
+    def test_cancel_pending_booking(self):
+        booking = self.create_booking()
+        old_updated_at = booking.updated_at
+
+        response = self.client.post(self.cancel_url(booking.pk))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['id'], booking.pk)
+        self.assertEqual(response.data['status'], 'cancelled')
+        booking.refresh_from_db()
+        self.assertEqual(booking.status, 'cancelled')
+        self.assertEqual(booking.cancelled_at, response.data['cancelled_at'])
+        self.assertGreater(booking.updated_at, old_updated_at)
+
+    def test_cancel_completed_booking_is_rejected(self):
+        booking = self.create_booking(booking_status='completed')
+
+        response = self.client.post(self.cancel_url(booking.pk))
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        booking.refresh_from_db()
+        self.assertEqual(booking.status, 'completed')
+        self.assertIsNone(booking.cancelled_at)
+
+    def test_cancel_missing_booking(self):
+        response = self.client.post(self.cancel_url(999999))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_cancel_non_numeric_pk(self):
+        response = self.client.post(self.cancel_url('abc'))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_cancel_other_guests_booking(self):
+        booking = self.create_booking(guest=self.other_guest)
+
+        response = self.client.post(self.cancel_url(booking.pk))
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        booking.refresh_from_db()
+        self.assertEqual(booking.status, 'pending')
+
+
+class ListingSearchTests(TestCase):
+    """ListingViewSet.search request validation"""
+
+    def test_unknown_amenity_is_rejected(self):
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user(username='searcher', password='pass'))
+
+        response = client.post(
+            reverse('listing-search'), {'amenities': ['wifi', 'bogus']}, format='json'
+        )
 
-# Create your tests here.
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('amenities', response.data)
@@ -1,5 +1,5 @@
 from django.shortcuts import render
-from django.http import HttpResponse
+from django.http import Http404, HttpResponse
 
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
@@ -7,14 +7,76 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, IsAuthenticatedOrReadOnly
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters
-from django.db.models import Q
+from django.core.cache import cache
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
+from datetime import date, timedelta
+from functools import reduce
+from operator import or_
+from .cache import LISTINGS_CACHE_TIMEOUT, listings_cache_key, schedule_listings_cache_bump
 from .models import Listing, Booking, Review, ListingImage
 from .serializers import (
-    ListingSerializer, CreateListingSerializer, BookingSerializer,
+    ListingSerializer, ListingListSerializer, CreateListingSerializer, BookingSerializer,
     CreateBookingSerializer, ReviewSerializer, HostResponseSerializer,
     BookingStatusSerializer, ListingSearchSerializer, ListingImageSerializer
 )
 
+# (search field, queryset lookup) pairs applied by ListingViewSet.search
+# city/country icontains are served by trigram indexes on PostgreSQL (migration 0003)
+_FILTER_MAP = (
+    ('city', 'city__icontains'),
+    ('country', 'country__icontains'),
+    ('guests', 'max_guests__gte'),
+    ('property_type', 'property_type'),
+    ('min_price', 'base_price__gte'),
+    ('max_price', 'base_price__lte'),
+)
+
+# Columns loaded for list/search rows; the heavy text columns like description are skipped
+_LISTING_LIST_FIELDS = (
+    'id', 'title', 'property_type', 'city', 'country', 'base_price',
+    'status', 'created_at', 'host', 'host__username',
+)
+
+# is_available covers this window from today when no dates are requested
+_DEFAULT_AVAILABILITY_WINDOW = timedelta(days=30)
+
+class InvalidateListingsCacheMixin:
+    """Bump the listings cache version on destroy; deletes send no post_save"""
+    
+    def perform_destroy(self, instance):
+        super().perform_destroy(instance)
+        schedule_listings_cache_bump()
+
+
+class EagerLoadingViewSetMixin:
+    """Finish querysets with the eager loading declared by the action's serializer"""
+    
+    def eager_load(self, queryset):
+        serializer_class = self.get_serializer_class()
+        if not hasattr(serializer_class, 'setup_eager_loading'):
+            return queryset
+        return serializer_class.setup_eager_loading(queryset, self.get_serializer_context())
+
+
+def listing_etag(request, pk=None, **kwargs):
+    """ETag for a listing detail response, or None to let the view handle a missing listing"""
+    try:
+        updated_at = Listing.objects.filter(pk=pk, status='active').values_list(
+            'updated_at', flat=True
+        ).first()
+    except (TypeError, ValueError):
+        return None
+    if updated_at is None:
+        return None
+    # The cache version moves with bookings/reviews/images, today with the default availability window
+    return listings_cache_key(
+        'retrieve', pk, updated_at, date.today(), request.query_params.urlencode()
+    )
+
+
 # Create your views here.
 def listing_list(request):
     return HttpResponse("List of listings")
@@ -22,7 +84,7 @@ def listing_list(request):
 def listing_detail(request, pk):
     return HttpResponse(f"Details of listing {pk}")
 
-class ListingViewSet(viewsets.ModelViewSet):
+class ListingViewSet(InvalidateListingsCacheMixin, EagerLoadingViewSetMixin, viewsets.ModelViewSet):
     permission_classes = [IsAuthenticatedOrReadOnly]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['property_type', 'city', 'country', 'max_guests']
@@ -30,100 +92,136 @@ class ListingViewSet(viewsets.ModelViewSet):
     ordering_fields = ['base_price', 'created_at', 'average_rating']
     ordering = ['-created_at']
     
+    def get_availability_window(self, check_in=None, check_out=None):
+        """Dates that is_available is reported for, computed once per request"""
+        if check_in and check_out:
+            return check_in, check_out
+        check_in = date.today()
+        return check_in, check_in + _DEFAULT_AVAILABILITY_WINDOW
+    
+    def get_base_queryset(self, check_in=None, check_out=None):
+        """Active listings with rating/availability annotations and the serializer's relations"""
+        queryset = Listing.objects.filter(status='active').with_ratings().with_availability(
+            *self.get_availability_window(check_in, check_out)
+        )
+        
+        if self.action in ('list', 'search'):
+            # List rows only render a subset of columns
+            queryset = queryset.only(*_LISTING_LIST_FIELDS)
+        return self.eager_load(queryset)
+    
     def get_queryset(self):
-        queryset = Listing.objects.filter(status='active')
+        if self.action == 'bookings':
+            # Only resolves the listing; its bookings are queried separately
+            return Listing.objects.filter(status='active')
         
-        # Filter by availability if dates provided
         check_in = self.request.query_params.get('check_in')
         check_out = self.request.query_params.get('check_out')
+        queryset = self.get_base_queryset(check_in, check_out)
         
+        # Filter by availability if dates provided
         if check_in and check_out:
-            # This is a simplified availability check
-            unavailable_listings = Booking.objects.filter(
-                Q(check_in__lt=check_out) & Q(check_out__gt=check_in),
-                status__in=['confirmed', 'active']
-            ).values_list('listing_id', flat=True)
-            
-            queryset = queryset.exclude(id__in=unavailable_listings)
+            queryset = queryset.filter(_is_available=True)
         
         return queryset
     
     def get_serializer_class(self):
         if self.action == 'create':
             return CreateListingSerializer
+        if self.action in ('list', 'search'):
+            return ListingListSerializer
         return ListingSerializer
     
     def perform_create(self, serializer):
         serializer.save(host=self.request.user)
     
+    @method_decorator(condition(etag_func=listing_etag))
+    def retrieve(self, request, *args, **kwargs):
+        # Repeat requests with a matching If-None-Match get a 304 before any serialization
+        return super().retrieve(request, *args, **kwargs)
+    
+    def list(self, request, *args, **kwargs):
+        # Responses don't depend on the user, so one cache entry per URL serves everyone
+        cache_key = listings_cache_key('list', request.build_absolute_uri())
+        data = cache.get(cache_key)
+        if data is None:
+            data = super().list(request, *args, **kwargs).data
+            cache.set(cache_key, data, LISTINGS_CACHE_TIMEOUT)
+        return Response(data)
+    
     @action(detail=False, methods=['post'])
     def search(self, request):
         serializer = ListingSearchSerializer(data=request.data)
         if serializer.is_valid():
-            queryset = Listing.objects.filter(status='active')
-            
             # Apply filters based on search criteria
             data = serializer.validated_data
             
-            if data.get('city'):
-                queryset = queryset.filter(city__icontains=data['city'])
-            
-            if data.get('country'):
-                queryset = queryset.filter(country__icontains=data['country'])
+            cache_key = listings_cache_key('search', data, request.build_absolute_uri())
+            cached = cache.get(cache_key)
+            if cached is not None:
+                return Response(cached)
             
-            if data.get('guests'):
-                queryset = queryset.filter(max_guests__gte=data['guests'])
+            check_in = data.get('check_in')
+            check_out = data.get('check_out')
+            # Aggregate querysets drop Meta.ordering, so order explicitly for stable pages
+            queryset = self.get_base_queryset(check_in, check_out).order_by(*self.ordering)
             
-            if data.get('property_type'):
-                queryset = queryset.filter(property_type=data['property_type'])
+            filters = {
+                lookup: data[field] for field, lookup in _FILTER_MAP
+                if data.get(field) is not None
+            }
             
-            if data.get('min_price'):
-                queryset = queryset.filter(base_price__gte=data['min_price'])
-            
-            if data.get('max_price'):
-                queryset = queryset.filter(base_price__lte=data['max_price'])
+            # Amenities filter (names are validated against AMENITY_FIELDS by the serializer)
+            amenity_filters = reduce(or_, (Q(**{a: True}) for a in data.get('amenities', [])), Q())
             
             # Availability check
-            if data.get('check_in') and data.get('check_out'):
-                unavailable_listings = Booking.objects.filter(
-                    Q(check_in__lt=data['check_out']) & Q(check_out__gt=data['check_in']),
-                    status__in=['confirmed', 'active']
-                ).values_list('listing_id', flat=True)
-                queryset = queryset.exclude(id__in=unavailable_listings)
+            if check_in and check_out:
+                filters['_is_available'] = True
             
-            # Amenities filter
-            if data.get('amenities'):
-                amenity_filters = Q()
-                for amenity in data['amenities']:
-                    amenity_filters |= Q(**{amenity: True})
-                queryset = queryset.filter(amenity_filters)
+            # Apply every scalar, amenity and availability condition in one filter() call
+            queryset = queryset.filter(amenity_filters, **filters)
             
             page = self.paginate_queryset(queryset)
             if page is not None:
-                serializer = ListingSerializer(page, many=True)
-                return self.get_paginated_response(serializer.data)
+                serializer = self.get_serializer(page, many=True)
+                response = self.get_paginated_response(serializer.data)
+            else:
+                serializer = self.get_serializer(queryset, many=True)
+                response = Response(serializer.data)
             
-            serializer = ListingSerializer(queryset, many=True)
-            return Response(serializer.data)
+            cache.set(cache_key, response.data, LISTINGS_CACHE_TIMEOUT)
+            return response
         
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
     
     @action(detail=True, methods=['get'])
     def bookings(self, request, pk=None):
         listing = self.get_object()
-        bookings = listing.bookings.all()
-        serializer = BookingSerializer(bookings, many=True)
-        return Response(serializer.data)
+        # The caller already has the listing, so skip its columns and the serializer
+        bookings = listing.bookings.order_by('-created_at').values(
+            'id', 'check_in', 'check_out', 'status', 'number_of_guests', 'total_price',
+            guest_name=F('guest__username'),
+        )
+        page = self.paginate_queryset(bookings)
+        data = list(bookings if page is None else page)
+        for booking in data:
+            # Match the string decimals the serializers render
+            booking['total_price'] = str(booking['total_price'])
+        
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
 
 
-class BookingViewSet(viewsets.ModelViewSet):
+class BookingViewSet(InvalidateListingsCacheMixin, EagerLoadingViewSetMixin, viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
     
     def get_queryset(self):
         user = self.request.user
+        queryset = self.eager_load(Booking.objects.all())
         if user.is_staff:
-            return Booking.objects.all()
-        return Booking.objects.filter(guest=user)
+            return queryset
+        return queryset.filter(guest=user)
     
     def get_serializer_class(self):
         if self.action == 'create':
@@ -137,20 +235,31 @@ class BookingViewSet(viewsets.ModelViewSet):
     
     @action(detail=True, methods=['post'])
     def cancel(self, request, pk=None):
-        booking = self.get_object()
-        if booking.can_be_cancelled:
-            booking.status = 'cancelled'
-            booking.cancelled_at = timezone.now()
-            booking.save()
-            serializer = BookingSerializer(booking)
-            return Response(serializer.data)
-        return Response(
-            {'error': 'This booking cannot be cancelled.'},
-            status=status.HTTP_400_BAD_REQUEST
-        )
+        # One conditional UPDATE both checks can_be_cancelled and applies the change
+        cancelled_at = timezone.now()
+        try:
+            updated = self.get_queryset().filter(
+                pk=pk, status__in=('pending', 'confirmed')
+            # update() doesn't apply auto_now, so stamp updated_at like save() did
+            ).update(status='cancelled', cancelled_at=cancelled_at, updated_at=cancelled_at)
+        except (TypeError, ValueError):
+            raise Http404
+        
+        if not updated:
+            # Raises 404 if the booking doesn't exist or isn't visible to this user
+            self.get_object()
+            return Response(
+                {'error': 'This booking cannot be cancelled.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        # update() skips post_save, so drop cached listing responses explicitly
+        schedule_listings_cache_bump()
+        # The client only needs the new state, not a re-read of the booking with its joins
+        return Response({'id': int(pk), 'status': 'cancelled', 'cancelled_at': cancelled_at})
 
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(InvalidateListingsCacheMixin, EagerLoadingViewSetMixin, viewsets.ModelViewSet):
     permission_classes = [IsAuthenticatedOrReadOnly]
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
     filterset_fields = ['listing', 'rating', 'is_verified']
@@ -158,7 +267,7 @@ class ReviewViewSet(viewsets.ModelViewSet):
     ordering = ['-created_at']
     
     def get_queryset(self):
-        return Review.objects.filter(is_public=True)
+        return self.eager_load(Review.objects.filter(is_public=True))
     
     def get_serializer_class(self):
         if self.action == 'update' and self.request.data.get('host_response'):
@@ -185,7 +294,7 @@ class ReviewViewSet(viewsets.ModelViewSet):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class ListingImageViewSet(viewsets.ModelViewSet):
+class ListingImageViewSet(InvalidateListingsCacheMixin, viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
     serializer_class = ListingImageSerializer
     